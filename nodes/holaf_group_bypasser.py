@@ -1,28 +1,35 @@
 from .holaf_utils import ANY_TYPE
 
+# Built once at import; INPUT_TYPES returns this dict as-is, so it must not be mutated.
+_INPUT_TYPES = {
+    "required": {
+        # CRITICAL CHANGE:
+        # Switched from (["None"],) to ("STRING", ...)
+        # This makes the input a free-text field for the Python validator,
+        # accepting any group name ("Step 1", "Step 2", etc.).
+        # The JavaScript will render it as a dropdown.
+        "comfy_group": ("STRING", {"default": "None"}), 
+        "group_name": ("STRING", {"default": "Group A"}),
+        "active": ("BOOLEAN", {"default": True, "label_on": "ON", "label_off": "OFF"}),
+        "bypass_mode": (["Bypass", "Mute"],),
+    },
+    "optional": {
+        "original": (ANY_TYPE,),
+        "alternative": (ANY_TYPE,),
+    }
+}
+
+
 class HolafGroupBypasser:
+    # Stateless node: no per-instance __dict__ needed.
+    __slots__ = ()
+
     def __init__(self):
         pass
 
     @classmethod
     def INPUT_TYPES(s):
-        return {
-            "required": {
-                # CRITICAL CHANGE:
-                # Switched from (["None"],) to ("STRING", ...)
-                # This makes the input a free-text field for the Python validator,
-                # accepting any group name ("Step 1", "Step 2", etc.).
-                # The JavaScript will render it as a dropdown.
-                "comfy_group": ("STRING", {"default": "None"}), 
-                "group_name": ("STRING", {"default": "Group A"}),
-                "active": ("BOOLEAN", {"default": True, "label_on": "ON", "label_off": "OFF"}),
-                "bypass_mode": (["Bypass", "Mute"],),
-            },
-            "optional": {
-                "original": (ANY_TYPE,),
-                "alternative": (ANY_TYPE,),
-            }
-        }
+        return _INPUT_TYPES
 
     RETURN_TYPES = (ANY_TYPE,)
     RETURN_NAMES = ("output",)
@@ -38,13 +45,7 @@ class HolafGroupBypasser:
         """Manages lazy evaluation to prevent 'Missing Input' errors
         when the source group is bypassed.
         """
-        if active:
-            return ["original"]
-        else:
-            return ["alternative"]
+        return ["original" if active else "alternative"]
 
     def process(self, comfy_group, group_name, active, bypass_mode, original=None, alternative=None, **kwargs):
-        if active:
-            return (original,)
-        else:
-            return (alternative,)
\ No newline at end of file
+        return (original if active else alternative,)
\ No newline at end of file
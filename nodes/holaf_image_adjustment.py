@@ -1,5 +1,63 @@
+import logging
 import torch
 
+logger = logging.getLogger("Holaf.ImageAdjustment")
+
+# Rec. 601 luma weights, cached per (device, dtype) so the saturation step
+# doesn't rebuild (and re-upload) the coefficient tensor on every call.
+_LUMA_CACHE = {}
+
+
+def _luma_weights(device, dtype):
+    key = (device, dtype)
+    weights = _LUMA_CACHE.get(key)
+    if weights is None:
+        weights = torch.tensor([0.299, 0.587, 0.114], device=device, dtype=dtype)
+        _LUMA_CACHE[key] = weights
+    return weights
+
+
+# torch.compile'd versions of _adjust_core, per (device, dtype). None marks a key
+# where torch.compile is unavailable or failed, so the eager path is used.
+_COMPILED_CORES = {}
+
+
+def _adjust_core(rgb, scale, bias, saturation, weights):
+    """Brightness/contrast, saturation and clamp as one pure expression, so that
+    torch.compile can fuse it into a single read-once/write-once kernel.
+    scale, bias and saturation are 0-d tensors to avoid a recompile per value."""
+    img = rgb * scale + bias
+    luma = torch.matmul(img, weights).unsqueeze(-1)
+    return torch.lerp(luma, img, saturation).clamp(0.0, 1.0)
+
+
+def _compiled_core(device, dtype):
+    key = (device, dtype)
+    if key not in _COMPILED_CORES:
+        compile_fn = getattr(torch, "compile", None)  # PyTorch < 2.0 has no torch.compile
+        _COMPILED_CORES[key] = compile_fn(_adjust_core, dynamic=True) if compile_fn is not None else None
+    return _COMPILED_CORES[key]
+
+
+# Built once at import; INPUT_TYPES returns this dict as-is, so it must not be mutated.
+_INPUT_TYPES = {
+    "required": {
+        "image": ("IMAGE",),
+        "brightness": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 5.0, "step": 0.05}),
+        "contrast": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 5.0, "step": 0.05}),
+        "saturation": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 5.0, "step": 0.05}),
+    },
+    "optional": {
+        # Do the arithmetic in bfloat16 on CUDA (half the memory traffic).
+        # Off by default to keep results bit-identical.
+        "low_precision": ("BOOLEAN", {"default": False}),
+        # Fuse the whole adjustment into one kernel with torch.compile.
+        # The first run per device/dtype pays the compilation time.
+        "use_compile": ("BOOLEAN", {"default": False}),
+    }
+}
+
+
 class HolafImageAdjustment:
     """
     Adjusts Brightness, Contrast, and Saturation of an image using pure PyTorch operations.
@@ -11,64 +69,85 @@ class HolafImageAdjustment:
 
     @classmethod
     def INPUT_TYPES(s):
-        return {
-            "required": {
-                "image": ("IMAGE",),
-                "brightness": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 5.0, "step": 0.05}),
-                "contrast": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 5.0, "step": 0.05}),
-                "saturation": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 5.0, "step": 0.05}),
-            }
-        }
+        return _INPUT_TYPES
 
     RETURN_TYPES = ("IMAGE",)
     RETURN_NAMES = ("image",)
     FUNCTION = "adjust_image"
     CATEGORY = "Holaf/Image"
 
-    def adjust_image(self, image, brightness, contrast, saturation):
+    def adjust_image(self, image, brightness, contrast, saturation, low_precision=False, use_compile=False):
         # Image comes in as [Batch, Height, Width, Channels]
-        # Clone to ensure we don't modify the original tensor if used elsewhere
-        img = image.clone()
+        # Neutral settings: the node is a pure passthrough, no copy needed.
+        if brightness == 1.0 and contrast == 1.0 and saturation == 1.0:
+            return (image,)
 
-        # Extract alpha if present so that brightness/contrast/saturation
-        # are only applied to the RGB channels. Alpha must be preserved intact.
-        has_alpha = img.shape[-1] == 4
-        if has_alpha:
-            alpha = img[..., 3:4].clone()
-            img = img[..., :3]
-        else:
-            alpha = None
-
-        # 1. Apply Contrast
-        # Formula: (color - middle_gray) * contrast + middle_gray
-        # We assume 0.5 is middle gray for float images (0.0 - 1.0)
-        if contrast != 1.0:
-            img = (img - 0.5) * contrast + 0.5
-
-        # 2. Apply Brightness
-        # We use a multiplier (Gain/Exposure style) rather than an offset.
-        # This keeps black as black (unless contrast moved it).
-        if brightness != 1.0:
-            img = img * brightness
-
-        # 3. Apply Saturation
-        if saturation != 1.0:
-            # Calculate Luma (Grayscale) using Rec. 601 coefficients
-            # 0.299 R + 0.587 G + 0.114 B
-            # img[..., 0] is Red, 1 is Green, 2 is Blue
-            luma = img[..., 0] * 0.299 + img[..., 1] * 0.587 + img[..., 2] * 0.114
-            
-            # Expand luma dimensions to match image for broadcasting: [B, H, W] -> [B, H, W, 1]
-            luma = luma.unsqueeze(-1)
-            
-            # Linear interpolation between Grayscale and Original
-            img = luma + (img - luma) * saturation
-
-        # Clamp values to valid 0.0 - 1.0 range to prevent artifacts
-        img = torch.clamp(img, 0.0, 1.0)
+        # Brightness/contrast/saturation are only applied to the RGB channels.
+        # Alpha, if present, must be preserved intact.
+        has_alpha = image.shape[-1] == 4
+        rgb = image[..., :3] if has_alpha else image
+
+        # The result is written into a single freshly allocated output (the input
+        # is never modified): RGB goes straight into its channels, alpha is copied
+        # next to it, so no clone and no final torch.cat are needed.
+        out = torch.empty_like(image)
+        out_rgb = out[..., :3] if has_alpha else out
+
+        # 1+2. Contrast and Brightness, fused into a single affine pass.
+        # Contrast: (color - middle_gray) * contrast + middle_gray, with 0.5 as
+        # middle gray for float images (0.0 - 1.0).
+        # Brightness: a multiplier (Gain/Exposure style) rather than an offset,
+        # which keeps black as black (unless contrast moved it).
+        # ((color - 0.5) * contrast + 0.5) * brightness == color * scale + bias
+        scale = contrast * brightness
+        bias = (0.5 - 0.5 * contrast) * brightness
+
+        # Optional reduced-precision math: the adjustment is purely memory-bound,
+        # so bfloat16 halves the bytes moved. Only worth it (and only enabled) on CUDA.
+        reduced_precision = low_precision and image.device.type == 'cuda'
+        work_dtype = torch.bfloat16 if reduced_precision else image.dtype
+
+        img = None
+        if use_compile and rgb.shape[-1] >= 3:
+            core = _compiled_core(image.device, work_dtype)
+            if core is not None:
+                params = torch.tensor([scale, bias, saturation], device=image.device, dtype=work_dtype)
+                try:
+                    img = core(rgb.to(work_dtype), params[0], params[1], params[2],
+                               _luma_weights(image.device, work_dtype))
+                except Exception as e:
+                    logger.warning(f"torch.compile failed ({e}); falling back to eager mode.")
+                    _COMPILED_CORES[(image.device, work_dtype)] = None
+
+        if img is None:
+            # bias + scale * color as a single kernel (torch.add with alpha). The
+            # 0-d CPU bias tensor is treated as a scalar, on any device and dtype.
+            bias_t = torch.tensor(bias)
+            if reduced_precision:
+                img = torch.add(bias_t, rgb.to(torch.bfloat16), alpha=scale)
+            else:
+                img = torch.add(bias_t, rgb, alpha=scale, out=out_rgb)
+
+            # 3. Apply Saturation (meaningless for single-channel images, e.g. masks)
+            if saturation != 1.0 and img.shape[-1] >= 3:
+                # Calculate Luma (Grayscale) using Rec. 601 coefficients
+                # 0.299 R + 0.587 G + 0.114 B, as one [.., 3] @ [3] matrix-vector product
+                weights = _luma_weights(img.device, img.dtype)
+                luma = torch.matmul(img, weights).unsqueeze_(-1)
+
+                # Linear interpolation between Grayscale and Original, written back
+                # into img ([B, H, W, 1] luma broadcasts against [B, H, W, 3])
+                torch.lerp(luma, img, saturation, out=img)
+
+            # Clamp values to valid 0.0 - 1.0 range to prevent artifacts
+            img.clamp_(0.0, 1.0)
+
+        # The compiled and reduced-precision paths compute in their own buffer.
+        if img is not out_rgb:
+            out_rgb.copy_(img)
 
         # Reattach the original alpha channel (unchanged)
         if has_alpha:
-            img = torch.cat([img, alpha], dim=-1)
+            out[..., 3:].copy_(image[..., 3:])
 
-        return (img,)
\ No newline at end of file
+        return (out,)
@@ -3,6 +3,33 @@ import logging
 
 logger = logging.getLogger("Holaf.ImageBatchSlice")
 
+# Built once at import; INPUT_TYPES returns this dict as-is, so it must not be mutated.
+_INPUT_TYPES = {
+    "required": {
+        "images": ("IMAGE",),
+        "start_index": ("INT", {
+            "default": 0, 
+            "min": 0, 
+            "max": 100000, 
+            "step": 1,
+            "display": "number" 
+        }),
+        "end_index": ("INT", {
+            "default": 10, 
+            "min": 0, 
+            "max": 100000, 
+            "step": 1,
+            "display": "number"
+        }),
+    },
+    "optional": {
+        # The slice is a zero-copy view of the input batch. Enable this
+        # only if a downstream consumer needs contiguous memory.
+        "make_contiguous": ("BOOLEAN", {"default": False}),
+    },
+}
+
+
 class HolafImageBatchSlice:
     """
     Node to select a specific range of images (frames) from a batch.
@@ -14,32 +41,14 @@ class HolafImageBatchSlice:
 
     @classmethod
     def INPUT_TYPES(s):
-        return {
-            "required": {
-                "images": ("IMAGE",),
-                "start_index": ("INT", {
-                    "default": 0, 
-                    "min": 0, 
-                    "max": 100000, 
-                    "step": 1,
-                    "display": "number" 
-                }),
-                "end_index": ("INT", {
-                    "default": 10, 
-                    "min": 0, 
-                    "max": 100000, 
-                    "step": 1,
-                    "display": "number"
-                }),
-            },
-        }
+        return _INPUT_TYPES
 
     RETURN_TYPES = ("IMAGE",)
     RETURN_NAMES = ("IMAGE",)
     FUNCTION = "slice_batch"
     CATEGORY = "Holaf/Image"
 
-    def slice_batch(self, images, start_index, end_index):
+    def slice_batch(self, images, start_index, end_index, make_contiguous=False):
         # images shape is [batch_size, height, width, channels]
 
         # 0. Guard: empty batch (edge case B9)
@@ -47,21 +56,26 @@ class HolafImageBatchSlice:
             logger.warning("Input batch is empty (0 images). Returning empty batch.")
             return (images,)
 
+        batch_size = images.shape[0]
+
         # 1. Clamp start_index to valid range
-        if start_index < 0:
-            start_index = 0
-        start_index = min(start_index, images.shape[0] - 1)
-            
+        start = min(max(0, int(start_index)), batch_size - 1)
+
         # 2. Logic for end_index (Inclusive)
-        # Python slice is exclusive [start:end], so we need end_index + 1.
-        slice_end = end_index + 1
+        # The slice end is exclusive, so we need end_index + 1. An end before the
+        # start yields an empty tensor of shape [0, H, W, C].
+        end = max(start, min(int(end_index) + 1, batch_size))
 
         # 3. Perform the slice
-        # PyTorch handles cases where slice_end <= start_index gracefully:
-        # it returns an empty tensor of shape [0, H, W, C].
-        sliced_images = images[start_index:slice_end]
+        # narrow() builds the view directly (no slice object / indexing dispatch)
+        # and never copies data.
+        sliced_images = images.narrow(0, start, end - start)
+        if make_contiguous:
+            sliced_images = sliced_images.contiguous()
         
-        # Debug info
-        logger.info(f"Request: {start_index} to {end_index}. Output count: {sliced_images.shape[0]}")
+        # Debug info (only formatted when debug logging is enabled, so normal runs
+        # don't pay for string formatting and a console write on every execution)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request: {start} to {end_index}. Output count: {sliced_images.shape[0]}")
 
         return (sliced_images,)
\ No newline at end of file
@@ -14,14 +14,35 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 # 
 
+import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import torch
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+import folder_paths
+from comfy.cli_args import args
 from nodes import PreviewImage
 
 logger = logging.getLogger("Holaf.ImageComparer")
 
+# Built once at import; INPUT_TYPES returns this dict as-is, so it must not be mutated.
+_INPUT_TYPES = {
+  "required": {
+    "image_a": ("IMAGE",),
+  },
+  "optional": {
+    "image_b": ("IMAGE",),
+  },
+  "hidden": {
+    "prompt": "PROMPT",
+    "extra_pnginfo": "EXTRA_PNGINFO"
+  },
+}
+
+
 # --- Node Definition ---
 class HolafImageComparer(PreviewImage):
   """
@@ -46,18 +67,42 @@ class HolafImageComparer(PreviewImage):
     image_a is now required to ensure standard preview behavior at minimum.
     image_b is optional for comparison.
     """
-    return {
-      "required": {
-        "image_a": ("IMAGE",),
-      },
-      "optional": {
-        "image_b": ("IMAGE",),
-      },
-      "hidden": {
-        "prompt": "PROMPT",
-        "extra_pnginfo": "EXTRA_PNGINFO"
-      },
-    }
+    return _INPUT_TYPES
+
+  def save_images(self, images, filename_prefix="ComfyUI", prompt=None, extra_pnginfo=None):
+    """
+    Same output as the inherited PreviewImage.save_images, but the float -> uint8
+    quantization is done once for the whole batch on the tensor's device, so
+    only uint8 data (1/4 of the bytes) crosses to the host.
+    """
+    filename_prefix += self.prefix_append
+    full_output_folder, filename, counter, subfolder, filename_prefix = folder_paths.get_save_image_path(
+      filename_prefix, self.output_dir, images[0].shape[1], images[0].shape[0])
+
+    images_np = images.detach().mul(255.0).clamp_(0, 255).to(torch.uint8).contiguous().cpu().numpy()
+
+    metadata = None
+    if not args.disable_metadata:
+      metadata = PngInfo()
+      if prompt is not None:
+        metadata.add_text("prompt", json.dumps(prompt))
+      if extra_pnginfo is not None:
+        for key in extra_pnginfo:
+          metadata.add_text(key, json.dumps(extra_pnginfo[key]))
+
+    results = []
+    for batch_number, image_np in enumerate(images_np):
+      filename_with_batch_num = filename.replace("%batch_num%", str(batch_number))
+      file = f"{filename_with_batch_num}_{counter:05}_.png"
+      Image.fromarray(image_np).save(os.path.join(full_output_folder, file), pnginfo=metadata, compress_level=self.compress_level)
+      results.append({
+        "filename": file,
+        "subfolder": subfolder,
+        "type": self.type
+      })
+      counter += 1
+
+    return { "ui": { "images": results } }
 
   def compare_images(self,
                      image_a,
@@ -73,17 +118,26 @@ class HolafImageComparer(PreviewImage):
     # Utilize the save_images method inherited from the parent PreviewImage class.
     # The saved image data is prepared for the frontend widget.
     ui_data = { "a_images":[], "b_images": [] }
-    
-    # Process Image A (Required)
-    if image_a is not None and len(image_a) > 0:
+    has_a = image_a is not None and len(image_a) > 0
+    has_b = image_b is not None and len(image_b) > 0
+
+    if has_a and has_b:
+      # Save A and B concurrently. PIL releases the GIL while encoding PNGs,
+      # and the distinct prefixes keep the files apart.
+      with ThreadPoolExecutor(max_workers=2) as executor:
+        future_a = executor.submit(self.save_images, image_a, filename_prefix + "a_", prompt, extra_pnginfo)
+        future_b = executor.submit(self.save_images, image_b, filename_prefix + "b_", prompt, extra_pnginfo)
+        ui_data['a_images'] = future_a.result().get('ui', {}).get('images', [])
+        ui_data['b_images'] = future_b.result().get('ui', {}).get('images', [])
+    elif has_a:
+      # Process Image A only (standard preview behavior)
       saved_a = self.save_images(image_a, filename_prefix + "a_", prompt, extra_pnginfo)
       ui_data['a_images'] = saved_a.get('ui', {}).get('images', [])
-
-    # Process Image B (Optional)
-    if image_b is not None and len(image_b) > 0:
+    elif has_b:
       saved_b = self.save_images(image_b, filename_prefix + "b_", prompt, extra_pnginfo)
       ui_data['b_images'] = saved_b.get('ui', {}).get('images', [])
-    else:
+
+    if not has_b:
       # Return a small placeholder instead of None to avoid downstream crashes
       logger.warning("image_b is None/empty; returning a 1×1 black placeholder.")
       image_b = torch.zeros(1, 1, 1, 3)
@@ -13,11 +13,26 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import functools
+
 import torch
-from PIL import Image, ImageColor
-import numpy as np
+from PIL import ImageColor
+
+
+# Target Instagram-compatible ratios: 1:1, 4:5 and 16:9. Ties resolve to the
+# first entry, in this order.
+_RATIOS = (1.0, 0.8, 1.7777777777777777)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_color(fill_color):
+    """Parses a color string, falling back to black if the color name is invalid.
+    Cached, since the same string comes back on every queued run."""
+    try:
+        return ImageColor.getcolor(fill_color, "RGB")
+    except ValueError:
+        return (0, 0, 0)
 
-from .holaf_utils import tensor_to_pil, pil_to_tensor
 
 class HolafInstagramResize:
     """
@@ -45,81 +60,58 @@ class HolafInstagramResize:
     CATEGORY = "Holaf"
 
     def resize_image(self, image, fill_color, auto_color):
-        # Convert the input tensor (Batch, H, W, C) to PIL Images and process all frames.
-        results = []
-        for b in range(image.shape[0]):
-            img = tensor_to_pil(image[b])
-
-            width, height = img.size
-            aspect_ratio = width / height
-
-            # Define the target Instagram-compatible ratios.
-            ratios = {
-                "1:1": 1.0,
-                "4:5": 0.8,
-                "16:9": 1.7777777777777777,
-            }
-
-            # Find the closest target ratio to the image's current ratio.
-            closest_ratio_name = min(ratios, key=lambda k: abs(ratios[k] - aspect_ratio))
-            closest_ratio = ratios[closest_ratio_name]
-
-            # Calculate the final canvas dimensions.
-            if aspect_ratio > closest_ratio:
-                final_width = width
-                final_height = int(round(width / closest_ratio))
-            elif aspect_ratio < closest_ratio:
-                final_width = int(round(height * closest_ratio))
-                final_height = height
-            else:
-                 final_width = width
-                 final_height = height
-
-            # Determine the fill color.
-            if auto_color:
-                fill_color = self.get_dominant_edge_color(img)
-                if fill_color is None:
-                    fill_color = "black"
-
-            # Parse the color string and fall back to black if the color name is invalid.
-            try:
-                fill_color_rgb = ImageColor.getcolor(fill_color, "RGB")
-            except ValueError:
-                fill_color_rgb = (0, 0, 0)
-
-            # Create a new blank canvas with the final dimensions and fill color.
-            resized_img = Image.new("RGB", (final_width, final_height), fill_color_rgb)
-
-            # Calculate offsets to center the original image on the new canvas.
-            x_offset = (final_width - width) // 2
-            y_offset = (final_height - height) // 2
-
-            # Paste the original image onto the canvas.
-            resized_img.paste(img, (x_offset, y_offset))
-
-            # Convert the final PIL Image back to a torch tensor for ComfyUI.
-            results.append(pil_to_tensor(resized_img))
-
-        final_tensor = torch.cat(results, dim=0).float()
-        return (final_tensor,)
-
-    def get_dominant_edge_color(self, image):
+        # Image comes in as [Batch, Height, Width, Channels]; all frames share one size.
+        batch_size, height, width = image.shape[0], image.shape[1], image.shape[2]
+        aspect_ratio = width / height
+
+        # Find the closest target ratio to the image's current ratio.
+        closest_ratio = min(_RATIOS, key=lambda r: abs(r - aspect_ratio))
+
+        # Calculate the final canvas dimensions.
+        if aspect_ratio > closest_ratio:
+            final_width = width
+            final_height = int(round(width / closest_ratio))
+        elif aspect_ratio < closest_ratio:
+            final_width = int(round(height * closest_ratio))
+            final_height = height
+        else:
+            final_width = width
+            final_height = height
+
+        # Calculate offsets to center the original image on the new canvas.
+        x_offset = (final_width - width) // 2
+        y_offset = (final_height - height) // 2
+
+        # The letterboxing is plain constant padding, so it is done on the tensor
+        # (and its device) directly: one RGB canvas for the whole batch, filled per
+        # frame, with the frames copied into the centre. No PIL/numpy roundtrip.
+        canvas = torch.empty((batch_size, final_height, final_width, 3), dtype=torch.float32, device=image.device)
+        if not auto_color:
+            fill_color_rgb = _parse_color(fill_color)
+            canvas[:] = torch.tensor(fill_color_rgb, dtype=torch.float32) / 255.0
+        else:
+            for b in range(batch_size):
+                fill_color_rgb = self._edge_color_tensor(image[b])
+                canvas[b] = torch.tensor(fill_color_rgb, dtype=torch.float32) / 255.0
+
+        # Alpha is dropped and grayscale is broadcast to RGB, as the RGB canvas did before.
+        rgb = image[..., :3]
+        canvas[:, y_offset:y_offset + height, x_offset:x_offset + width, :] = rgb
+
+        return (canvas,)
+
+    def _edge_color_tensor(self, frame):
         """
-        Analyzes the image edges to find the average color.
+        Averages the edge pixels of a single [H, W, C] frame tensor and returns
+        an (R, G, B) tuple. Runs on the tensor's device; only the four edge strips
+        are read and only three values are transferred back.
         """
-        # Extract edge rows/columns via numpy (no full-image copy)
-        arr = np.array(image)
-        pixels_top = arr[0, :, :]        # shape (W, 3)
-        pixels_bottom = arr[-1, :, :]   # shape (W, 3)
-        pixels_left = arr[:, 0, :]      # shape (H, 3)
-        pixels_right = arr[:, -1, :]     # shape (H, 3)
-        all_edge_pixels = np.concatenate([pixels_top, pixels_bottom, pixels_left, pixels_right], axis=0)
-
-        # Calculate the average R, G, B values.
-        avg = all_edge_pixels.mean(axis=0)
-        average_r = int(avg[0])
-        average_g = int(avg[1])
-        average_b = int(avg[2])
-
-        # Return the color as an "rgb(r,g,b)" string.
-        return f"rgb({average_r}, {average_g}, {average_b})"
\ No newline at end of file
+        rgb = frame[..., :3]
+        if rgb.shape[-1] == 1:
+            rgb = rgb.expand(-1, -1, 3)
+        edges = torch.cat([rgb[0, :], rgb[-1, :], rgb[:, 0], rgb[:, -1]], dim=0)
+
+        # Quantize like tensor_to_pil before averaging, so the color matches the
+        # mean of the 8-bit edge pixels.
+        edges = edges.mul(255).clamp_(0, 255).to(torch.uint8)
+        return tuple(int(c) for c in edges.float().mean(dim=0).tolist())
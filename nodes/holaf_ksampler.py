@@ -22,6 +22,47 @@ from .holaf_utils import prepare_cond_for_tile
 
 logger = logging.getLogger("Holaf.KSampler")
 
+# torch.compile'd diffusion models, keyed on (id(diffusion_model), device, dtype).
+# Values are (diffusion_model, compiled); compiled is None where compilation
+# failed, so the eager path is used. Only the latest entry is kept, and it is
+# released as soon as compile_unet is off: it references the model, so it would
+# otherwise pin an unloaded checkpoint in memory.
+_COMPILED_UNETS = {}
+
+
+def _compiled_diffusion_model(diffusion_model, device, dtype):
+    key = (id(diffusion_model), device, dtype)
+    if key not in _COMPILED_UNETS:
+        _COMPILED_UNETS.clear()
+        # dynamic=None: the first resolution is compiled static; the first
+        # different one triggers a single recompile with dynamic height/width,
+        # which then serves every later resolution. dynamic=False would recompile
+        # per resolution until Dynamo's cache limit and then silently drop to eager.
+        # This bound relies on the default mode: "reduce-overhead" would still
+        # record a new CUDA graph (with its own memory pool) per distinct shape.
+        _COMPILED_UNETS[key] = (diffusion_model, torch.compile(diffusion_model, dynamic=None))
+    return _COMPILED_UNETS[key][1]
+
+
+def _is_compile_error(e):
+    """torch.compile compiles lazily, so backend failures (e.g. no Triton) only
+    surface on the first forward pass, raised as a TorchDynamoException."""
+    dynamo_exc = getattr(getattr(torch, "_dynamo", None), "exc", None)
+    return dynamo_exc is not None and isinstance(e, dynamo_exc.TorchDynamoException)
+
+
+def _prep_image_for_vae(image):
+    """
+    Returns the RGB pixels of an IMAGE batch for vae.encode. VAE.encode itself
+    does the NHWC -> NCHW movedim, so a contiguous NHWC tensor already has a
+    channels-last layout for its convolutions; only the RGBA case (a strided
+    view) is made contiguous, once. Device transfer is left to VAE.encode,
+    which moves the pixels batch by batch according to free VRAM.
+    """
+    rgb = image[..., :3]
+    return rgb if rgb.is_contiguous() else rgb.contiguous()
+
+
 class HolafKSampler:
     """
     A wrapper for the core ComfyUI sampler.
@@ -50,6 +91,14 @@ class HolafKSampler:
             "optional": {
                  "latent_image": ("LATENT",),
                  "image": ("IMAGE",),
+                 # Run the diffusion model through torch.compile (Inductor), falling back
+                 # to eager mode if compilation fails.
+                 # The first run pays the compilation time, plus one recompile the
+                 # first time the resolution changes.
+                 "compile_unet": ("BOOLEAN", {"default": False}),
+                 # Decode the output latents one at a time to cap VAE decode VRAM at a
+                 # single image (ComfyUI otherwise batches by its free-memory estimate).
+                 "vae_slice": ("BOOLEAN", {"default": False}),
             }
         }
 
@@ -61,7 +110,7 @@ class HolafKSampler:
     def sample(self, model, positive, negative, vae,
                      seed, steps, cfg, sampler_name, scheduler, denoise,
                      input_type, clean_vram, bypass,
-                     latent_image=None, image=None):
+                     latent_image=None, image=None, compile_unet=False, vae_slice=False):
         """
         Executes the sampling process, handling input type, device placement, VRAM, and bypass logic.
         """
@@ -82,7 +131,7 @@ class HolafKSampler:
             # If input is an image, we need to encode it to get a latent for the latent output.
             elif input_type == "image" and image is not None:
                 if latent_image is None: # Only encode if no latent was provided
-                    final_latent = {"samples": vae.encode(image[:,:,:,:3])}
+                    final_latent = {"samples": vae.encode(_prep_image_for_vae(image))}
                 else: # A latent was already provided, just pass it through
                     final_latent = latent_image
 
@@ -90,7 +139,7 @@ class HolafKSampler:
             if image_out is None and final_latent is not None:
                 image_out = vae.decode(final_latent["samples"].to(vae.device))
             elif final_latent is None and image_out is not None:
-                final_latent = {"samples": vae.encode(image_out[:,:,:,:3])}
+                final_latent = {"samples": vae.encode(_prep_image_for_vae(image_out))}
             elif final_latent is None and image_out is None:
                 # Fallback if both inputs are missing
                 dummy_latent = {"samples": torch.zeros(1, 4, 64, 64)}
@@ -113,7 +162,7 @@ class HolafKSampler:
             if image is None:
                 raise ValueError("Input type is 'image', but no image provided.")
             # Encode the input image into latent space using the provided VAE.
-            encoded_output = vae.encode(image[:,:,:,:3])
+            encoded_output = vae.encode(_prep_image_for_vae(image))
             # Handle different VAE encode return types.
             if isinstance(encoded_output, dict) and "samples" in encoded_output:
                 latent = encoded_output
@@ -137,18 +186,42 @@ class HolafKSampler:
 
         # Clone the model to prevent in-place modifications to the original model patcher.
         # model.clone() removed - not needed for sampling
+        # (except for compile_unet, which patches the clone's diffusion model only).
+        sampling_model = model
+        if compile_unet:
+            if hasattr(torch, "compile"):
+                diffusion_model = model.get_model_object("diffusion_model")
+                compiled = _compiled_diffusion_model(diffusion_model, device, latent_samples.dtype)
+                if compiled is not None:
+                    sampling_model = model.clone()
+                    sampling_model.add_object_patch("diffusion_model", compiled)
+            else:
+                logger.warning("compile_unet requires PyTorch 2.0+ (torch.compile); sampling in eager mode.")
+        else:
+            # Release the compiled wrapper, and the model it references.
+            _COMPILED_UNETS.clear()
 
         # --- Sampling ---
-        pbar = comfy.utils.ProgressBar(steps)
-        def preview_callback(step, x0, x, total_steps):
-            pbar.update(1)
+        def run_sampler(sampler_model):
+            pbar = comfy.utils.ProgressBar(steps)
+            def preview_callback(step, x0, x, total_steps):
+                pbar.update(1)
+
+            # Execute the core comfy sampler.
+            return comfy.sample.sample(sampler_model, noise, steps, cfg, sampler_name, scheduler,
+                                       positive_copy, negative_copy, latent_samples,
+                                       denoise=denoise, disable_noise=False, start_step=None,
+                                       last_step=None, force_full_denoise=False, noise_mask=None,
+                                       callback=preview_callback, disable_pbar=True, seed=seed)
 
-        # Execute the core comfy sampler.
-        sampled_output = comfy.sample.sample(model, noise, steps, cfg, sampler_name, scheduler,
-                                             positive_copy, negative_copy, latent_samples,
-                                             denoise=denoise, disable_noise=False, start_step=None,
-                                             last_step=None, force_full_denoise=False, noise_mask=None,
-                                             callback=preview_callback, disable_pbar=True, seed=seed)
+        try:
+            sampled_output = run_sampler(sampling_model)
+        except Exception as e:
+            if sampling_model is model or not _is_compile_error(e):
+                raise
+            logger.warning(f"torch.compile failed ({e}); falling back to eager mode.")
+            _COMPILED_UNETS[(id(diffusion_model), device, latent_samples.dtype)] = (diffusion_model, None)
+            sampled_output = run_sampler(model)
 
         # --- Output Handling ---
         # Extract the final latent tensor from the sampler's output.
@@ -163,11 +236,31 @@ class HolafKSampler:
         final_latent = {"samples": final_latent_samples}
 
         # Decode the resulting latent into a pixel-space image.
-        image_out = vae.decode(final_latent["samples"])
+        if vae_slice and final_latent["samples"].shape[0] > 1:
+            image_out = self._decode_sliced(vae, final_latent["samples"])
+        else:
+            image_out = vae.decode(final_latent["samples"])
         image_out = image_out.to(comfy.model_management.intermediate_device())
 
         # Move the final latent to CPU for output to conserve VRAM.
         final_latent["samples"] = final_latent["samples"].cpu()
 
         # Pass through the original inputs for chaining.
-        return (model, positive, negative, vae, final_latent, image_out)
\ No newline at end of file
+        return (model, positive, negative, vae, final_latent, image_out)
+
+    def _decode_sliced(self, vae, samples):
+        """
+        Decodes a batch of latents one sample at a time, writing each result into
+        a single preallocated output (no list of chunks, no torch.cat).
+        """
+        first = vae.decode(samples[:1])
+        # A sample can decode to several frames (video VAEs), so the output is
+        # sized from the first decoded slice.
+        per_sample = first.shape[0]
+        image_out = torch.empty((samples.shape[0] * per_sample,) + tuple(first.shape[1:]),
+                                dtype=first.dtype, device=comfy.model_management.intermediate_device())
+        image_out[:per_sample] = first
+        del first
+        for i in range(1, samples.shape[0]):
+            image_out[i * per_sample:(i + 1) * per_sample] = vae.decode(samples[i:i + 1])
+        return image_out
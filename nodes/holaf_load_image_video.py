@@ -77,8 +77,11 @@ class HolafLoadImageVideo:
         container = av.open(video_path)
         try:
             stream = container.streams.video[0]
+            # Frames are kept as the uint8 arrays PyAV returns (a quarter of the
+            # float32 size) and normalized once at the end, straight into the
+            # preallocated output arrays: no per-frame float32 copy, no np.stack.
             frames = []
-            masks = []
+            alphas = []
             for idx, frame in enumerate(container.decode(stream)):
                 if max_frames > 0 and idx >= max_frames:
                     break
@@ -91,21 +94,27 @@ class HolafLoadImageVideo:
                     logger.warning("Frame %d: unexpected array shape %s (expected HxWx3 or HxWx4); skipping.",
                                    idx, img_np.shape)
                     continue
-                img_np = img_np.astype(np.float32) / 255.0
-                if img_np.shape[2] == 4:
-                    frames.append(img_np[:, :, :3])
-                    masks.append(1.0 - img_np[:, :, 3])
-                else:
-                    # No alpha channel: fully opaque mask
-                    frames.append(img_np)
-                    masks.append(np.ones(img_np.shape[:2], dtype=np.float32))
+                frames.append(img_np)
+                # No alpha channel: fully opaque mask
+                alphas.append(img_np[:, :, 3] if img_np.shape[2] == 4 else None)
             if not frames:
                 raise ValueError("Video read but no frames retrieved.")
         finally:
             container.close()
 
-        image_tensor = torch.from_numpy(np.stack(frames))
-        mask_tensor = torch.from_numpy(np.stack(masks))
+        height, width = frames[0].shape[:2]
+        image_np = np.empty((len(frames), height, width, 3), dtype=np.float32)
+        mask_np = np.empty((len(frames), height, width), dtype=np.float32)
+        for i, (frame_np, alpha_np) in enumerate(zip(frames, alphas)):
+            np.divide(frame_np[:, :, :3], 255.0, out=image_np[i], dtype=np.float32)
+            if alpha_np is None:
+                mask_np[i] = 1.0
+            else:
+                np.divide(alpha_np, 255.0, out=mask_np[i], dtype=np.float32)
+                np.subtract(1.0, mask_np[i], out=mask_np[i])
+
+        image_tensor = torch.from_numpy(image_np)
+        mask_tensor = torch.from_numpy(mask_np)
         
         return {
             "result": (image_tensor, mask_tensor)
@@ -89,20 +89,36 @@ class HolafLutGenerator:
         Matches the color distribution of a source image to a reference image.
         It operates on a per-channel basis, using the cumulative distribution function (CDF)
         to map source color values to the reference's color distribution.
+
+        Both inputs are uint8, so the histograms of all channels are built with a
+        single np.bincount over (value * C + channel) indices, and the image is
+        remapped in one gather through a (256, C) LUT.
+
+        Each source level maps to the smallest reference level whose CDF reaches
+        the source CDF (strict histogram specification, found with np.searchsorted).
         """
-        matched_channels = []
-        for i in range(source_np.shape[2]): # Process R, G, B channels independently
-            source_channel = source_np[:, :, i]
-            ref_channel = reference_np[:, :, i]
-            source_values, bin_idx, source_counts = np.unique(source_channel, return_inverse=True, return_counts=True)
-            ref_values, ref_counts = np.unique(ref_channel, return_counts=True)
-            source_cdf = np.cumsum(source_counts).astype(np.float64) / source_channel.size
-            ref_cdf = np.cumsum(ref_counts).astype(np.float64) / ref_channel.size
-            # Interpolate to find new pixel values
-            interpolated_values = np.interp(source_cdf, ref_cdf, ref_values)
-            matched_channel = interpolated_values[bin_idx].reshape(source_channel.shape)
-            matched_channels.append(matched_channel)
-        matched_np = np.stack(matched_channels, axis=-1).astype(np.uint8)
+        channels = source_np.shape[2]
+        channel_ids = np.arange(channels, dtype=np.intp)
+
+        def _channel_histograms(image_np):
+            packed = image_np.reshape(-1, channels).astype(np.intp) * channels + channel_ids
+            return np.bincount(packed.ravel(), minlength=256 * channels).reshape(256, channels)
+
+        source_counts = _channel_histograms(source_np)
+        ref_counts = _channel_histograms(reference_np)
+        source_cdf = np.cumsum(source_counts, axis=0) / (source_np.shape[0] * source_np.shape[1])
+        ref_cdf = np.cumsum(ref_counts, axis=0) / (reference_np.shape[0] * reference_np.shape[1])
+
+        # The LUT is stored as uint8 so the remap below writes uint8 directly,
+        # without materializing a float64 copy of the whole image.
+        lut = np.empty((256, channels), dtype=np.uint8)
+        for i in range(channels):
+            # Levels absent from the reference never become the first index reaching
+            # a CDF value (their CDF equals the previous level's), so no filtering is needed.
+            lut[:, i] = np.minimum(np.searchsorted(ref_cdf[:, i], source_cdf[:, i], side='left'), 255)
+
+        source_flat = source_np.reshape(-1, channels).astype(np.intp)
+        matched_np = np.take_along_axis(lut, source_flat, axis=0).reshape(source_np.shape)
         return matched_np
 
     def generate_lut(self, reference_image: torch.Tensor, lut_size: int, title: str, neutral_image: torch.Tensor = None):
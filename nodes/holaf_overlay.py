@@ -16,7 +16,7 @@
 import torch
 import numpy as np
 import logging
-from PIL import Image, ImageOps, ImageChops
+from PIL import Image, ImageChops
 
 from .holaf_utils import tensor_to_pil, pil_to_tensor
 
@@ -57,35 +57,42 @@ class HolafOverlayNode:
         batch_size_ov = overlay_image.shape[0]
         batch_size = batch_size_bg
 
+        # A single-frame input is broadcast over the other batch by indexing
+        # frame i % batch_size inside the loop, rather than materializing a
+        # repeated copy of it.
         if batch_size_bg != batch_size_ov:
-            if batch_size_ov == 1 and batch_size_bg > 1:
-                overlay_image = overlay_image.repeat(batch_size_bg, 1, 1, 1)
-                if mask is not None and mask.shape[0] == 1:
-                    mask = mask.repeat(batch_size_bg, 1, 1)
-            elif batch_size_bg == 1 and batch_size_ov > 1:
-                background_image = background_image.repeat(batch_size_ov, 1, 1, 1)
+            if batch_size_bg == 1:
                 batch_size = batch_size_ov
-            else:
+            elif batch_size_ov != 1:
                 batch_size = min(batch_size_bg, batch_size_ov)
                 logger.warning(f"Batch size mismatch between background ({batch_size_bg}) and overlay ({batch_size_ov}). "
                       f"Only the first {batch_size} frame(s) will be processed; the remaining frames are silently discarded.")
 
-        results = []
+        # Convert the mask (or the overlay alpha) of the whole batch to uint8 once,
+        # so the device-to-host copy happens once instead of once per frame.
+        mask_np_batch = None
+        if mask is not None:
+            mask_np_batch = mask.float().mul(255).clamp(0, 255).byte().cpu().numpy()
+        elif overlay_image.shape[-1] == 4:
+            mask_np_batch = overlay_image[..., 3].float().mul(255).clamp(0, 255).byte().cpu().numpy()
+        if mask_np_batch is not None:
+            # Invert in place for the whole batch (black=apply, white=skip),
+            # instead of allocating an ImageOps.invert copy per frame.
+            np.subtract(255, mask_np_batch, out=mask_np_batch)
+
+        # The output batch is allocated once from the first frame's shape and
+        # filled in place, instead of collecting frames and concatenating them.
+        result_tensor_batch = None
         for i in range(batch_size):
-            bg_pil = tensor_to_pil(background_image[i]).convert("RGBA")
-            ov_pil = tensor_to_pil(overlay_image[i]).convert("RGBA")
+            bg_pil = tensor_to_pil(background_image[i % batch_size_bg]).convert("RGBA")
+            ov_pil = tensor_to_pil(overlay_image[i % batch_size_ov]).convert("RGBA")
             bg_width, bg_height = bg_pil.size
             ov_orig_width, ov_orig_height = ov_pil.size
 
             # --- Mask Creation ---
-            if mask is not None:
-                mask_tensor_slice = mask[i % mask.shape[0]]
-                mask_np_scaled = mask_tensor_slice.cpu().float().mul(255).clamp(0, 255).byte().numpy()
-                base_mask_pil = ImageOps.invert(Image.fromarray(mask_np_scaled, mode='L'))
-            elif overlay_image.shape[-1] == 4:
-                alpha_tensor = overlay_image[i, :, :, 3]
-                alpha_np_scaled = alpha_tensor.cpu().float().mul(255).clamp(0, 255).byte().numpy()
-                base_mask_pil = ImageOps.invert(Image.fromarray(alpha_np_scaled, mode='L'))
+            if mask_np_batch is not None:
+                mask_np_scaled = mask_np_batch[i % mask_np_batch.shape[0]]
+                base_mask_pil = Image.fromarray(mask_np_scaled, mode='L')
             else:
                 base_mask_pil = Image.new('L', (ov_orig_width, ov_orig_height), 255)
 
@@ -132,10 +139,12 @@ class HolafOverlayNode:
             final_mask = ImageChops.multiply(base_mask_pil, ov_pil.split()[3])
             result_pil.paste(ov_pil, (paste_x, paste_y), final_mask)
             
-            results.append(pil_to_tensor(result_pil))
+            result_tensor = pil_to_tensor(result_pil)
+            if result_tensor_batch is None:
+                result_tensor_batch = torch.empty((batch_size,) + tuple(result_tensor.shape[1:]), dtype=result_tensor.dtype)
+            result_tensor_batch[i] = result_tensor[0]
 
-        if not results:
+        if result_tensor_batch is None:
             return (background_image,)
 
-        result_tensor_batch = torch.cat(results, dim=0)
         return (result_tensor_batch,)
\ No newline at end of file
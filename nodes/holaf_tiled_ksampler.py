@@ -315,8 +315,8 @@ class HolafTiledKSampler:
                 # (Previously the global noise was sliced per tile, which made tile_seed ineffective
                 #  because comfy.sample.sample uses the provided noise as-is when disable_noise=False.)
                 tile_noise = comfy.sample.prepare_noise(tile_latent, tile_seed, None).to(device)
-                # Prepare fresh conditioning per tile to avoid in-place mutation issues
-                # (some samplers modify conditioning in-place for pools/mask).
+                # Fresh conditioning containers per tile (new list and dicts, shared
+                # tensors), so keys a sampler reassigns for one tile don't leak into the next.
                 tile_positive = prepare_cond_for_tile(positive, device)
                 tile_negative = prepare_cond_for_tile(negative, device)
                 sampled_output = comfy.sample.sample(model, tile_noise, steps, cfg, sampler_name, scheduler, 
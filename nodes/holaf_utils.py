@@ -60,11 +60,14 @@ def validate_subfolder(base_path, subfolder, allowed_base=None):
 
 
 def prepare_cond_for_tile(original_cond_list, device):
-    """Shallow copy + tensor clone (faster than deepcopy for large conditionings).
-
-    Note: This uses a shallow dict copy. If any values in the conditioning dict
-    are mutable nested objects, they will be shared between copies. This is
-    acceptable for ComfyUI conditioning dicts which are not mutated in place.
+    """Structural copy of a conditioning list for one sampler call (much faster than deepcopy).
+
+    The outer list, each [tensor, dict] pair and each dict are new objects, so the
+    sampler can reassign keys freely. Tensors are shared, not cloned: they are only
+    moved with tensor.to(device), which returns the same tensor when it is already
+    there. Tensor values inside the dict (e.g. pooled_output) are moved too.
+    Other nested values are shared, which is fine for ComfyUI conditioning dicts,
+    as they are not mutated in place.
     """
     if not isinstance(original_cond_list, list):
         return []
@@ -72,13 +75,14 @@ def prepare_cond_for_tile(original_cond_list, device):
     for item in original_cond_list:
         if isinstance(item, (list, tuple)) and len(item) >= 1:
             if torch.is_tensor(item[0]):
-                cloned_tensor = item[0].clone().to(device)
-                cond_dict = item[1].copy() if len(item) > 1 and isinstance(item[1], dict) else {}
-                cond_list_copy.append([cloned_tensor, cond_dict])
+                cond_dict = {}
+                if len(item) > 1 and isinstance(item[1], dict):
+                    cond_dict = {k: v.to(device) if torch.is_tensor(v) else v for k, v in item[1].items()}
+                cond_list_copy.append([item[0].to(device), cond_dict])
             else:
                 cond_list_copy.append(list(item))
         elif torch.is_tensor(item):
-            cond_list_copy.append([item.clone().to(device), {}])
+            cond_list_copy.append([item.to(device), {}])
         else:
             cond_list_copy.append(item)
     return cond_list_copy
@@ -125,8 +129,10 @@ def tensor_to_pil(tensor):
     if tensor.numel() == 0:
         return Image.new('RGB', (1, 1), color='black')
 
-    # PyTorch SIMD conversion (avoids numpy float64 promotion)
-    image_np = tensor.cpu().float().mul(255).clamp(0, 255).byte().numpy()
+    # Quantize to uint8 on the tensor's own device before the host transfer
+    # (4x fewer bytes to copy than float32, no numpy float64 promotion).
+    # clamp_ only touches the temporary produced by mul.
+    image_np = tensor.detach().float().mul(255).clamp_(0, 255).to(torch.uint8).contiguous().cpu().numpy()
 
     if image_np.ndim == 3 and image_np.shape[2] in [1, 3, 4]:
         # Ambiguous case: both shape[0] and shape[2] could be channels.
@@ -158,7 +164,8 @@ def pil_to_tensor(image):
     Grayscale images are expanded to 3-channel RGB. RGBA images that lost
     their alpha channel are re-expanded with a fully opaque alpha.
     """
-    image_np = np.array(image).astype(np.float32) / 255.0
+    image_np = np.array(image, dtype=np.float32)
+    image_np /= 255.0
     if image.mode == 'RGBA' and image_np.shape[-1] == 3:
         alpha_channel = np.ones_like(image_np[..., :1])
         image_np = np.concatenate((image_np, alpha_channel), axis=-1)